@@ -8,14 +8,17 @@ Includes:
 Always displays correlation heatmap.
 """
 
-import plotly.express as px
 import plotly.graph_objects as go
-from dash import Dash, html, dcc
-from dash.dependencies import Input, Output
+from dash import Dash, Patch, html, dcc, ctx, no_update
+from dash.dependencies import Input, Output, State
 from datetime import datetime, UTC
+from threading import Lock
+from types import SimpleNamespace
+import numpy as np
 import pandas as pd
 
 from data_fetching import fetch_cross_asset_data
+from kernels import corr_matrix, make_rolling_corr_kernel
 
 # -----------------------------------------------------------
 # App Setup
@@ -29,6 +32,36 @@ DATE_OPTIONS = {
     "1y": ("1y", "1d"),
 }
 
+CRYPTOS = ["BTC", "ETH", "SOL", "XRP"]
+
+BUTTON_METRICS = {"btn-vol": "vol", "btn-dd": "dd", "btn-corr": "corr"}
+
+# Rolling correlation window, baked into the kernel as a constant
+ROLLING_WINDOW = 30
+rolling_corr_kernel = make_rolling_corr_kernel(ROLLING_WINDOW)
+
+# Figure skeletons: sent once with the page layout; callbacks then
+# Patch() only the trace data and titles.
+RISK_FIGURE = go.Figure().update_layout(
+    title=dict(text=""),
+    xaxis=dict(type="-"),
+    yaxis=dict(title=dict(text="")),
+)
+
+HEATMAP_FIGURE = go.Figure(
+    go.Heatmap(
+        colorscale="RdYlGn",
+        zmin=-1,
+        zmax=1,
+        texttemplate="%{z:.3f}",
+        textfont=dict(size=14),
+        hovertemplate="%{x} / %{y}: %{z:.3f}<extra></extra>",
+    )
+).update_layout(
+    title=dict(text="Full Cross-Asset Correlation Matrix"),
+    yaxis=dict(autorange="reversed"),
+)
+
 app.layout = html.Div(
     style={"fontFamily": "Arial", "margin": "25px"},
     children=[
@@ -57,11 +90,14 @@ app.layout = html.Div(
 
         html.Div(id="last-update", style={"marginBottom": "20px"}),
 
+        # Currently selected risk metric
+        dcc.Store(id="risk-metric", data="vol"),
+
         # Single risk chart
-        dcc.Graph(id="risk-chart"),
+        dcc.Graph(id="risk-chart", figure=RISK_FIGURE),
 
         # Always-visible correlation heatmap
-        dcc.Graph(id="correlation-heatmap"),
+        dcc.Graph(id="correlation-heatmap", figure=HEATMAP_FIGURE),
 
         # Auto-refresh
         dcc.Interval(
@@ -73,13 +109,113 @@ app.layout = html.Div(
 )
 
 # -----------------------------------------------------------
-# Callback
+# Derived data (cached per dataset)
+# Everything downstream of the fetched frame that doesn't depend on
+# the selected risk metric. Reused for as long as fetch_cross_asset_data
+# keeps returning the same (TTL-cached) frame.
+# -----------------------------------------------------------
+def _derive(frame):
+    # -------- FULL DATASET (yields + Nasdaq + cryptos) --------
+    # Copy so the cached frame is never mutated downstream
+    df = frame.copy().dropna()
+
+    if df.empty:
+        return None
+
+    # Crypto subset for crypto-specific risk
+    df_crypto = df[CRYPTOS]
+
+    # Returns for all assets (for full correlation matrix)
+    # df is already NaN-free, so only the first row of returns is empty
+    returns_all = df.pct_change(fill_method=None).iloc[1:]
+
+    # Returns for crypto-only (for vol/dd/corr stress)
+    returns_crypto = df_crypto.pct_change(fill_method=None).iloc[1:]
+
+    # -----------------------------------------------------------
+    # CORRELATION MATRIX (Always Visible)
+    # Includes yields + Nasdaq + all cryptos
+    # -----------------------------------------------------------
+
+    corr = corr_matrix(returns_all).round(3)
+
+    return SimpleNamespace(
+        df=df,
+        df_crypto=df_crypto,
+        returns_all=returns_all,
+        returns_crypto=returns_crypto,
+        corr=corr,
+    )
+
+
+def rolling_corr_vs_nasdaq(data):
+    """Rolling correlation of each crypto against Nasdaq, shape (C, N - w + 1)."""
+    return rolling_corr_kernel(
+        data.returns_crypto[CRYPTOS].to_numpy(dtype=np.float32),
+        data.returns_all["Nasdaq"].to_numpy(dtype=np.float32),
+    )
+
+
+# Warm up the JIT at import so the first "Correlation Stress" click doesn't
+# pay compile time. A tiny frame goes through the same _derive/to_numpy
+# path as real data, so the kernel is compiled for exactly the array types
+# (e.g. read-only views under pandas 3) the callback will pass.
+rolling_corr_vs_nasdaq(
+    _derive(
+        pd.DataFrame(
+            np.linspace(1.0, 2.0, (ROLLING_WINDOW + 2) * (len(CRYPTOS) + 1)).reshape(
+                ROLLING_WINDOW + 2, -1
+            ),
+            columns=["Nasdaq", *CRYPTOS],
+            dtype=np.float32,
+        )
+    )
+)
+
+
+# date_key -> (fetched frame, derived data)
+_derived = {}
+
+# Both callbacks fire together on load/refresh; serialize them per date
+# range so each dataset is fetched and derived once, without a slow fetch
+# for one range blocking the other.
+_derive_locks = {date_key: Lock() for date_key in DATE_OPTIONS}
+
+
+def get_derived(date_key):
+    period, interval = DATE_OPTIONS[date_key]
+
+    with _derive_locks[date_key]:
+        frame = fetch_cross_asset_data(period=period, interval=interval)
+
+        cached = _derived.get(date_key)
+        if cached is None or cached[0] is not frame:
+            cached = _derived[date_key] = (frame, _derive(frame))
+
+        return cached[1]
+
+# -----------------------------------------------------------
+# Callbacks
+# Split per output so button clicks never re-send the heatmap.
 # -----------------------------------------------------------
+def risk_patch(traces, title, yaxis_title="", xaxis_type="-"):
+    """Patch the risk chart's traces and titles, leaving its layout in place.
+
+    The x-axis type is set explicitly because the chart switches between
+    categorical bars and dated lines without a full layout reset.
+    """
+    fig = Patch()
+    fig["data"] = traces
+    fig["layout"]["title"]["text"] = title
+    fig["layout"]["yaxis"]["title"]["text"] = yaxis_title
+    fig["layout"]["xaxis"]["type"] = xaxis_type
+    return fig
+
+
 @app.callback(
     [
         Output("risk-chart", "figure"),
-        Output("correlation-heatmap", "figure"),
-        Output("last-update", "children"),
+        Output("risk-metric", "data"),
     ],
     [
         Input("interval-component", "n_intervals"),
@@ -88,117 +224,119 @@ app.layout = html.Div(
         Input("btn-dd", "n_clicks"),
         Input("btn-corr", "n_clicks"),
     ],
+    State("risk-metric", "data"),
 )
-def update_dashboard(n, date_key, n_vol, n_dd, n_corr):
+def update_risk_chart(n, date_key, n_vol, n_dd, n_corr, selected):
+
+    # Refresh ticks only update the heatmap; keep the current risk chart
+    trigger = ctx.triggered_id
+    if trigger == "interval-component":
+        return no_update, no_update
 
-    # Determine last clicked button
-    buttons = {"vol": n_vol, "dd": n_dd, "corr": n_corr}
-    selected = max(buttons, key=buttons.get)
+    # Button clicks switch the metric; date changes redraw the current one
+    selected = BUTTON_METRICS.get(trigger, selected or "vol")
 
     if date_key is None:
         date_key = "1y"
 
-    period, interval = DATE_OPTIONS[date_key]
+    data = get_derived(date_key)
 
-    # -------- FULL DATASET (yields + Nasdaq + cryptos) --------
-    df = fetch_cross_asset_data(period=period, interval=interval).dropna()
-
-    if df.empty:
-        empty = go.Figure().update_layout(title="No data loaded")
-        return empty, empty, "⚠ No data returned"
-
-    # Crypto subset for crypto-specific risk
-    cryptos = ["BTC", "ETH", "SOL", "XRP"]
-    df_crypto = df[cryptos].dropna()
-
-    # Returns for all assets (for full correlation matrix)
-    returns_all = df.pct_change().dropna()
-
-    # Returns for crypto-only (for vol/dd/corr stress)
-    returns_crypto = df_crypto.pct_change().dropna()
+    if data is None:
+        return risk_patch([], "No data loaded"), selected
 
     # -----------------------------------------------------------
     # 1) ANNUALIZED VOLATILITY
     # -----------------------------------------------------------
     if selected == "vol":
-        ann_vol = returns_crypto.std() * (365 ** 0.5)
+        ann_vol = data.returns_crypto.std() * (365 ** 0.5)
 
-        fig = go.Figure()
-        fig.add_bar(
-            x=ann_vol.index,
-            y=ann_vol.values,
-            marker_color=["#BF1A1A", "#F5AD18", "#9E1C60", "#DC143C"],
-        )
-        fig.update_layout(title="Annualized Volatility (Crypto)", yaxis_title="Vol")
+        traces = [
+            go.Bar(
+                x=ann_vol.index.tolist(),
+                y=ann_vol.to_numpy(dtype=np.float32),
+                marker_color=["#BF1A1A", "#F5AD18", "#9E1C60", "#DC143C"],
+            )
+        ]
+        title, yaxis_title, xaxis_type = "Annualized Volatility (Crypto)", "Vol", "category"
 
     # -----------------------------------------------------------
     # 2) MAXIMUM DRAWDOWN
     # -----------------------------------------------------------
     elif selected == "dd":
-        running_max = df_crypto.cummax()
-        drawdowns = df_crypto / running_max - 1
-        maxdd = drawdowns.min()
-
-        fig = go.Figure()
-        fig.add_bar(
-            x=maxdd.index,
-            y=maxdd.values,
-            marker_color=["#BF1A1A", "#F5AD18", "#9E1C60", "#DC143C"],
+        prices = data.df_crypto.to_numpy()
+        running_max = np.maximum.accumulate(prices, axis=0)
+        maxdd = pd.Series(
+            (prices / running_max - 1.0).min(axis=0),
+            index=data.df_crypto.columns,
         )
-        fig.update_layout(title="Maximum Drawdown (Crypto)", yaxis_title="Drawdown")
+
+        traces = [
+            go.Bar(
+                x=maxdd.index.tolist(),
+                y=maxdd.to_numpy(dtype=np.float32),
+                marker_color=["#BF1A1A", "#F5AD18", "#9E1C60", "#DC143C"],
+            )
+        ]
+        title, yaxis_title, xaxis_type = "Maximum Drawdown (Crypto)", "Drawdown", "category"
 
     # -----------------------------------------------------------
     # 3) CORRELATION STRESS — Rolling 30-day vs Nasdaq
     # -----------------------------------------------------------
     else:  # selected == "corr"
-        fig = go.Figure()
+        traces = []
+
+        if "Nasdaq" in data.df.columns:
+            # All four crypto correlations in one compiled pass
+            rolling_corr = rolling_corr_vs_nasdaq(data)
+            corr_index = data.returns_crypto.index[ROLLING_WINDOW - 1:]
+
+            traces = [
+                go.Scatter(
+                    x=corr_index,
+                    y=rolling_corr[i],
+                    mode="lines",
+                    name=c,
+                )
+                for i, c in enumerate(CRYPTOS)
+            ]
 
-        if "Nasdaq" in df.columns:
-            nasdaq_ret = df["Nasdaq"].pct_change().dropna()
+        title, yaxis_title, xaxis_type = "Rolling 30-Day Correlation vs Nasdaq", "Correlation", "date"
 
-            for c in cryptos:
-                series = returns_crypto[c]
+    return risk_patch(traces, title, yaxis_title, xaxis_type), selected
 
-                rolling_corr = series.rolling(30).corr(nasdaq_ret)
 
-                fig.add_trace(
-                    go.Scatter(
-                        x=rolling_corr.index,
-                        y=rolling_corr,
-                        mode="lines",
-                        name=c,
-                    )
-                )
+@app.callback(
+    [
+        Output("correlation-heatmap", "figure"),
+        Output("last-update", "children"),
+    ],
+    [
+        Input("interval-component", "n_intervals"),
+        Input("date-range", "value"),
+    ],
+)
+def update_heatmap(n, date_key):
 
-        fig.update_layout(
-            title="Rolling 30-Day Correlation vs Nasdaq",
-            yaxis_title="Correlation",
-        )
+    if date_key is None:
+        date_key = "1y"
 
-    # -----------------------------------------------------------
-    # CORRELATION MATRIX (Always Visible)
-    # Includes yields + Nasdaq + all cryptos
-    # -----------------------------------------------------------
+    data = get_derived(date_key)
 
-    corr = returns_all.corr().round(3)
+    fig = Patch()
 
-    fig_corr = px.imshow(
-        corr,
-        color_continuous_scale="RdYlGn",
-        zmin=-1,
-        zmax=1,
-        aspect="auto",
-        title="Full Cross-Asset Correlation Matrix",
-    )
-    fig_corr.update_traces(
-        text=corr.values,
-        texttemplate="%{text:.3f}",
-        textfont=dict(size=14),
-    )
+    if data is None:
+        fig["data"][0]["z"] = []
+        fig["layout"]["title"]["text"] = "No data loaded"
+        return fig, "⚠ No data returned"
+
+    fig["data"][0]["z"] = data.corr.to_numpy()
+    fig["data"][0]["x"] = data.corr.columns.tolist()
+    fig["data"][0]["y"] = data.corr.index.tolist()
+    fig["layout"]["title"]["text"] = HEATMAP_FIGURE.layout.title.text
 
     timestamp = f"Last updated: {datetime.now(UTC):%Y-%m-%d %H:%M UTC}"
 
-    return fig, fig_corr, timestamp
+    return fig, timestamp
 
 # -----------------------------------------------------------
 # Run Server
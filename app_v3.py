@@ -10,14 +10,16 @@ Includes:
 Includes date range selector and auto-refresh every 15 minutes.
 """
 
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.colors import qualitative
 from dash import Dash, html, dcc
 from dash.dependencies import Input, Output
 from datetime import datetime, UTC
+import numpy as np
+import pandas as pd
 
 from data_fetching import fetch_cross_asset_data
+from kernels import corr_matrix
 
 # -----------------------------------------------------------
 # App Setup
@@ -92,7 +94,9 @@ def update_dashboard(n, date_key):
     yields = ["3M_Yield",  "10Y_Yield"]
     assets = ["BTC", "ETH", "SOL", "XRP"]
 
-    df_norm = df / df.iloc[0]
+    # One broadcast divide on the float32 array (no pandas alignment)
+    arr = df.to_numpy(dtype=np.float32, copy=False)
+    df_norm = pd.DataFrame(arr / arr[0], index=df.index, columns=df.columns)
 
     fig_norm = go.Figure()
 
@@ -104,7 +108,7 @@ def update_dashboard(n, date_key):
             fig_norm.add_trace(
                 go.Scatter(
                     x=df_norm.index,
-                    y=df_norm[col],
+                    y=df_norm[col].to_numpy(),
                     mode="lines",
                     name=col,
                     yaxis="y1",
@@ -127,7 +131,7 @@ def update_dashboard(n, date_key):
             fig_norm.add_trace(
                 go.Scatter(
                     x=df_norm.index,
-                    y=df_norm[col],
+                    y=df_norm[col].to_numpy(),
                     mode="lines",
                     name=col,
                     yaxis="y2",
@@ -170,22 +174,23 @@ def update_dashboard(n, date_key):
     # ---------- Correlation Matrix ----------
     # -----------------------------------------------------------
 
-    df_clean = df.ffill().bfill()
-    returns = df_clean.pct_change(fill_method=None).dropna()
-    corr = returns.corr().round(3)
-
-    fig_corr = px.imshow(
-        corr,
-        color_continuous_scale="RdYlGn",
-        zmin=-1,
-        zmax=1,
-        aspect="auto",
-    )
-
-    fig_corr.update_traces(
-        text=corr.values,
-        texttemplate="%{text:.3f}",
-        textfont=dict(size=16),
+    # df is already forward/back-filled by fetch_cross_asset_data
+    returns = df.pct_change(fill_method=None).iloc[1:]
+    corr = corr_matrix(returns).round(3)
+
+    # Plain Heatmap trace; cells are formatted from z on the client
+    fig_corr = go.Figure(
+        go.Heatmap(
+            z=corr.to_numpy(),
+            x=corr.columns.tolist(),
+            y=corr.index.tolist(),
+            colorscale="RdYlGn",
+            zmin=-1,
+            zmax=1,
+            texttemplate="%{z:.3f}",
+            textfont=dict(size=16),
+            hovertemplate="%{x} / %{y}: %{z:.3f}<extra></extra>",
+        )
     )
 
     fig_corr.update_layout(
@@ -193,7 +198,7 @@ def update_dashboard(n, date_key):
         width=900,
         height=900,
         xaxis=dict(tickfont=dict(size=16)),
-        yaxis=dict(tickfont=dict(size=16)),
+        yaxis=dict(tickfont=dict(size=16), autorange="reversed"),
     )
 
     timestamp = f"Last updated: {datetime.now(UTC):%Y-%m-%d %H:%M UTC}"
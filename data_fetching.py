@@ -1,12 +1,20 @@
 # data_fetching.py
+import logging
 import os
+import tempfile
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
+from cachetools.func import ttl_cache
 import yfinance as yf
 from pandas_datareader import data as web
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 
 FRED_API_KEY = os.getenv("FRED_API_KEY", None)
 
+logger = logging.getLogger(__name__)
+
 # -------------------------------------------------------------------
 # All yields from FRED (consistent, daily, long history)
 # -------------------------------------------------------------------
@@ -33,50 +41,190 @@ YAHOO_TICKERS = {
 # -------------------------------------------------------------------
 # FRED fetch helper
 # -------------------------------------------------------------------
+def period_days(period: str) -> int:
+    """Convert a period like "180d" or "1y" into a number of days."""
+    return int(period.replace("d", "")) if "d" in period else 365
+
+
 def fetch_fred_series(series: str, period: str) -> pd.DataFrame:
-    """Fetch daily FRED series like DGS1, DGS2, DGS10."""
+    """Fetch daily FRED series like DGS1, DGS2, DGS10.
+
+    Deprecated: use fetch_fred_yields, which fetches every series
+    concurrently over a single date range.
+    """
+    warnings.warn(
+        "fetch_fred_series is deprecated; use fetch_fred_yields",
+        DeprecationWarning,
+        stacklevel=2,
+    )
     end = datetime.utcnow()
-    days = int(period.replace("d", "")) if "d" in period else 365
-    start = end - timedelta(days=days)
+    start = end - timedelta(days=period_days(period))
 
-    df = web.DataReader(series, "fred", start, end, api_key=FRED_API_KEY)
-    return df.ffill().bfill()
+    # Gaps are filled once, on the merged frame in fetch_cross_asset_data
+    return web.DataReader(series, "fred", start, end, api_key=FRED_API_KEY)
 
 # -------------------------------------------------------------------
-# Main fetcher
+# Yahoo fetch helpers
+# Daily closes are kept in a parquet cache so refreshes only pull the
+# bars since the last cached date.
 # -------------------------------------------------------------------
-def fetch_cross_asset_data(period: str, interval: str):
-    # Yahoo intraday not available for long ranges → force 1d
-    if period in ["180d", "1y"]:
-        interval = "1d"
+YAHOO_CACHE_PATH = os.path.join(os.path.dirname(__file__), "cache", "yahoo.parquet")
+
+# History kept on disk: the longest period offered by the dashboards ("1y")
+YAHOO_CACHE_DAYS = 365
+
 
-    # ---- Fetch Yahoo assets ----
+def download_yahoo_close(**kwargs) -> pd.DataFrame:
+    """Download close prices for all Yahoo tickers, labelled by asset."""
     df_yahoo = yf.download(
         tickers=list(YAHOO_TICKERS.values()),
-        period=period,
-        interval=interval,
         auto_adjust=False,
         progress=False,
+        **kwargs,
     )
 
+    if df_yahoo.empty:
+        return pd.DataFrame(columns=list(YAHOO_TICKERS.keys()))
+
     if isinstance(df_yahoo.columns, pd.MultiIndex):
         close = df_yahoo["Close"].copy()
     else:
         close = df_yahoo.copy()
 
+    # yfinance sorts columns by ticker; restore our ticker order before labelling
+    if set(close.columns) == set(YAHOO_TICKERS.values()):
+        close = close[list(YAHOO_TICKERS.values())]
+
     close.columns = list(YAHOO_TICKERS.keys())
+    return close
+
+
+def read_yahoo_cache():
+    """Return the cached daily closes, or None if missing/stale."""
+    if not os.path.exists(YAHOO_CACHE_PATH):
+        return None
+
+    try:
+        cached = pd.read_parquet(YAHOO_CACHE_PATH)
+    except (OSError, ImportError) as exc:
+        logger.warning("Ignoring unreadable Yahoo cache %s: %s", YAHOO_CACHE_PATH, exc)
+        return None
+
+    if list(cached.columns) != list(YAHOO_TICKERS.keys()):
+        return None
+
+    return cached
+
+
+def write_yahoo_cache(close: pd.DataFrame):
+    """Persist the daily closes; a failed write is logged, never raised."""
+    try:
+        _write_yahoo_cache(close)
+    except (OSError, ImportError) as exc:
+        # The downloaded frame is still valid; only the cache is lost
+        logger.warning("Could not write Yahoo cache %s: %s", YAHOO_CACHE_PATH, exc)
+
+
+def _write_yahoo_cache(close: pd.DataFrame):
+    cache_dir = os.path.dirname(YAHOO_CACHE_PATH)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # Unique temp file per writer, so concurrent writers (threads or
+    # gunicorn workers) never share it; os.replace swaps it in atomically
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".parquet.tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            close.to_parquet(f, engine="pyarrow")
+        os.replace(tmp_path, YAHOO_CACHE_PATH)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
 
-    # ---- Fetch FRED yields ----
-    fred_frames = []
-    for label, series in FRED_TICKERS.items():
-        df_fred = fetch_fred_series(series, period)
-        df_fred.columns = [label]
-        fred_frames.append(df_fred)
 
-    df_fred_all = pd.concat(fred_frames, axis=1)
+def fetch_yahoo_close(period: str, interval: str) -> pd.DataFrame:
+    """Fetch close prices for all Yahoo tickers."""
+    # Only daily bars are cached
+    if interval != "1d":
+        return download_yahoo_close(period=period, interval=interval)
+
+    # First day of the window; like Yahoo's own period pulls, the window
+    # covers period_days(period) calendar days up to and including today
+    today = pd.Timestamp.now(tz="UTC").tz_localize(None).normalize()
+    start = today - timedelta(days=period_days(period) - 1)
+    cached = read_yahoo_cache()
+
+    # A few days of slack: the first bar of a full pull can land after `start`
+    if cached is None or cached.empty or cached.index.min() > start + timedelta(days=3):
+        # Cold start (or not enough history cached): full pull
+        fresh = download_yahoo_close(period=period, interval=interval)
+    else:
+        # Re-pull from the last cached bar, which may have been partial
+        fresh = download_yahoo_close(start=cached.index.max(), interval=interval)
+
+    if fresh.empty:
+        close = fresh if cached is None else cached
+    else:
+        # Fresh values win, but a ticker that failed on the re-pull (NaN)
+        # keeps its cached value instead of overwriting good history
+        if cached is not None:
+            close = fresh.combine_first(cached)[list(YAHOO_TICKERS.keys())]
+        else:
+            close = fresh.sort_index()
+
+        # Keep the cache bounded to the longest period the dashboards use
+        cutoff = today - timedelta(days=YAHOO_CACHE_DAYS - 1)
+        write_yahoo_cache(close.loc[close.index >= cutoff])
+
+    if close.empty:
+        return close
+
+    # Cold and cached paths are sliced to the same window
+    return close.loc[close.index >= start]
+
+# -------------------------------------------------------------------
+# Source fetchers
+# -------------------------------------------------------------------
+def fetch_fred_yields(period: str) -> pd.DataFrame:
+    """Fetch all FRED yields concurrently over one shared date range."""
+    # Naive UTC: pandas_datareader truncates against a naive date index
+    end = datetime.now(UTC).replace(tzinfo=None)
+    start = end - timedelta(days=period_days(period))
+
+    def fetch(series):
+        return web.DataReader(series, "fred", start, end, api_key=FRED_API_KEY)
+
+    with ThreadPoolExecutor(max_workers=len(FRED_TICKERS)) as executor:
+        fred_frames = list(executor.map(fetch, FRED_TICKERS.values()))
+
+    # Build one frame in a single alignment pass (no per-frame rename/concat)
+    return pd.DataFrame(
+        {
+            label: df_fred.iloc[:, 0]
+            for label, df_fred in zip(FRED_TICKERS.keys(), fred_frames)
+        }
+    )
+
+# -------------------------------------------------------------------
+# Main fetcher
+# Cached for 15 minutes to match the dashboard's refresh interval.
+# Callers must not mutate the returned frame.
+# -------------------------------------------------------------------
+@ttl_cache(maxsize=8, ttl=900)
+def fetch_cross_asset_data(period: str, interval: str):
+    # Yahoo intraday not available for long ranges → force 1d
+    if period in ["180d", "1y"]:
+        interval = "1d"
+
+    # ---- Fetch Yahoo assets and FRED yields concurrently ----
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        yahoo_future = executor.submit(fetch_yahoo_close, period, interval)
+        fred_future = executor.submit(fetch_fred_yields, period)
+        close = yahoo_future.result()
+        df_fred_all = fred_future.result()
 
     # ---- Merge all ----
     df = pd.concat([df_fred_all, close], axis=1)
     df = df.sort_index().ffill().bfill()
 
-    return df
+    # float32 is plenty for daily prices and halves memory traffic downstream
+    return df.astype(np.float32)
@@ -0,0 +1,77 @@
+# kernels.py
+"""
+Numeric kernels for the dashboard's hot paths.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from numba import njit
+
+# -------------------------------------------------------------------
+# Rolling correlation (window size specialized at compile time)
+# -------------------------------------------------------------------
+@lru_cache(maxsize=None)
+def make_rolling_corr_kernel(w):
+    """Build a kernel computing rolling correlations over a fixed window w.
+
+    Numba freezes the closed-over w as a compile-time constant, so the
+    per-window reductions have a known trip count and are fully unrolled.
+    The kernel takes X (N, C) and y (N,) and returns a (C, N - w + 1) array
+    in X's dtype: row j is column j's series, contiguous so it can go
+    straight into a Plotly trace, and entry i covers samples i .. i + w - 1
+    (no leading NaNs).
+    """
+
+    # Compiled lazily: pandas may hand over read-only arrays, which an
+    # explicit float32[:, :] signature would reject.
+    @njit(cache=True, fastmath=True, error_model="numpy")
+    def kernel(X, y):
+        n, c = X.shape
+        out = np.empty((c, max(n - w + 1, 0)), X.dtype)
+
+        for i in range(n - w + 1):
+            mean_y = 0.0
+            for k in range(w):
+                mean_y += y[i + k]
+            mean_y /= w
+
+            ss_y = 0.0
+            for k in range(w):
+                dy = y[i + k] - mean_y
+                ss_y += dy * dy
+
+            for j in range(c):
+                mean_x = 0.0
+                for k in range(w):
+                    mean_x += X[i + k, j]
+                mean_x /= w
+
+                ss_x = 0.0
+                ss_xy = 0.0
+                for k in range(w):
+                    dx = X[i + k, j] - mean_x
+                    ss_x += dx * dx
+                    ss_xy += dx * (y[i + k] - mean_y)
+
+                out[j, i] = ss_xy / np.sqrt(ss_x * ss_y)
+
+        return out
+
+    return kernel
+
+
+# -------------------------------------------------------------------
+# Correlation matrix (one GEMM on the standardized matrix)
+# -------------------------------------------------------------------
+def corr_matrix(returns: pd.DataFrame) -> pd.DataFrame:
+    """Pearson correlation matrix of a NaN-free returns frame.
+
+    Computed in the frame's own float dtype (float32 from data_fetching).
+    """
+    X = returns.to_numpy(copy=True)
+    X -= X.mean(axis=0)
+    X /= X.std(axis=0, ddof=1)
+    corr = (X.T @ X) / (X.shape[0] - 1)
+    return pd.DataFrame(corr, index=returns.columns, columns=returns.columns)
@@ -0,0 +1,71 @@
+from contextvars import copy_context
+
+import numpy as np
+import pandas as pd
+import pytest
+from dash._callback_context import context_value
+from dash._utils import AttributeDict
+
+import app
+from data_fetching import FRED_TICKERS, YAHOO_TICKERS
+
+
+@pytest.fixture
+def fake_data(monkeypatch):
+    """Serve a synthetic float32 frame shaped like fetch_cross_asset_data."""
+    rng = np.random.default_rng(0)
+    columns = list(FRED_TICKERS) + list(YAHOO_TICKERS)
+    index = pd.date_range("2025-01-01", periods=120, freq="D")
+    prices = np.exp(np.cumsum(rng.normal(0, 0.02, (len(index), len(columns))), axis=0))
+    df = pd.DataFrame(prices, index=index, columns=columns).astype(np.float32)
+
+    monkeypatch.setattr(app, "fetch_cross_asset_data", lambda period, interval: df)
+    app._derived.clear()
+    yield df
+    app._derived.clear()
+
+
+def run_risk_chart(trigger):
+    def run():
+        context_value.set(
+            AttributeDict(triggered_inputs=[{"prop_id": f"{trigger}.n_clicks", "value": 1}])
+        )
+        return app.update_risk_chart(0, "180d", 0, 0, 1, "vol")
+
+    return copy_context().run(run)
+
+
+def patched_traces(patch):
+    for op in patch.to_plotly_json()["operations"]:
+        if op["operation"] == "Assign" and op["location"] == ["data"]:
+            return op["params"]["value"]
+    raise AssertionError("risk chart patch does not assign data")
+
+
+def test_corr_branch_end_to_end(fake_data):
+    # The import-time warm-up compiles exactly the types the callback passes
+    warmed = list(app.rolling_corr_kernel.signatures)
+    assert warmed
+
+    patch, selected = run_risk_chart("btn-corr")
+
+    assert app.rolling_corr_kernel.signatures == warmed
+    assert selected == "corr"
+    traces = patched_traces(patch)
+    assert [t.name for t in traces] == app.CRYPTOS
+    for trace in traces:
+        assert trace.y.dtype == np.float32 and trace.y.flags.c_contiguous
+
+    returns = fake_data.pct_change(fill_method=None).iloc[1:]
+    expected = returns["BTC"].rolling(app.ROLLING_WINDOW).corr(returns["Nasdaq"]).dropna()
+    np.testing.assert_allclose(np.asarray(traces[0].y), expected.to_numpy(), atol=1e-4)
+
+
+def test_derived_data_follows_fetched_frame(fake_data, monkeypatch):
+    first = app.get_derived("180d")
+    assert app.get_derived("180d") is first
+
+    # A new frame from the fetcher (its TTL expired) must be re-derived
+    refreshed = fake_data * 2
+    monkeypatch.setattr(app, "fetch_cross_asset_data", lambda period, interval: refreshed)
+    assert app.get_derived("180d") is not first
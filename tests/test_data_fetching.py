@@ -0,0 +1,119 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_fetching
+from data_fetching import YAHOO_TICKERS
+
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache" / "yahoo.parquet")
+    monkeypatch.setattr(data_fetching, "YAHOO_CACHE_PATH", path)
+    return path
+
+
+def closes(index):
+    values = np.arange(len(index) * len(YAHOO_TICKERS), dtype=float)
+    return pd.DataFrame(
+        values.reshape(len(index), -1), index=index, columns=list(YAHOO_TICKERS)
+    )
+
+
+def test_concurrent_cache_writes(cache_path):
+    frames = [closes(pd.date_range("2025-01-01", periods=50 + i)) for i in range(8)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(data_fetching.write_yahoo_cache, frames))
+
+    cached = pd.read_parquet(cache_path)
+    assert any(cached.equals(frame) for frame in frames)
+    assert os.listdir(os.path.dirname(cache_path)) == ["yahoo.parquet"]
+
+
+def fake_yahoo(monkeypatch):
+    """Mimic yf.download: period pulls end today, start pulls run to today."""
+    today = pd.Timestamp.now(tz="UTC").tz_localize(None).normalize()
+
+    def download(period=None, start=None, interval="1d"):
+        if period is not None:
+            days = 366 if period == "1y" else int(period.replace("d", ""))
+            start = today - pd.Timedelta(days=days - 1)
+        return closes(pd.date_range(start, today))
+
+    monkeypatch.setattr(data_fetching, "download_yahoo_close", download)
+
+
+def test_cold_and_cached_paths_return_same_window(cache_path, monkeypatch):
+    fake_yahoo(monkeypatch)
+
+    cold = data_fetching.fetch_yahoo_close("180d", "1d")
+
+    # Warm the cache with a longer history, then read the 180d window from it
+    os.remove(cache_path)
+    data_fetching.fetch_yahoo_close("1y", "1d")
+    cached = data_fetching.fetch_yahoo_close("180d", "1d")
+
+    assert len(cold) == len(cached) == 180
+    assert cold.index.equals(cached.index)
+
+
+def test_incremental_pull_appends_new_bars(cache_path, monkeypatch):
+    today = pd.Timestamp.now(tz="UTC").tz_localize(None).normalize()
+    history = closes(pd.date_range(today - pd.Timedelta(days=200), today - pd.Timedelta(days=1)))
+    data_fetching.write_yahoo_cache(history)
+
+    pulls = []
+    frames = []
+
+    def download(period=None, start=None, interval="1d"):
+        pulls.append(start)
+        fresh = closes(pd.date_range(start, today)) + 1000
+        # BTC fails on the re-pull of the last cached bar
+        fresh.loc[start, "BTC"] = np.nan
+        frames.append(fresh)
+        return fresh
+
+    monkeypatch.setattr(data_fetching, "download_yahoo_close", download)
+    close = data_fetching.fetch_yahoo_close("180d", "1d")
+
+    # Only the delta since the last cached bar is pulled
+    last_cached = history.index.max()
+    assert pulls == [last_cached]
+    fresh = frames[0]
+    assert close.index.max() == today
+
+    on_disk = pd.read_parquet(cache_path)
+    assert list(on_disk.columns) == list(YAHOO_TICKERS)
+    # The failed ticker keeps its cached value; the others take the re-pull
+    assert on_disk.loc[last_cached, "BTC"] == history.loc[last_cached, "BTC"]
+    assert on_disk.loc[last_cached, "ETH"] == fresh.loc[last_cached, "ETH"]
+    assert not on_disk.isna().any().any()
+
+
+def test_cache_write_failure_does_not_fail_fetch(tmp_path, monkeypatch):
+    # The cache "directory" is a regular file, so every write fails
+    blocker = tmp_path / "cache"
+    blocker.write_text("")
+    monkeypatch.setattr(data_fetching, "YAHOO_CACHE_PATH", str(blocker / "yahoo.parquet"))
+    fake_yahoo(monkeypatch)
+
+    close = data_fetching.fetch_yahoo_close("180d", "1d")
+
+    assert len(close) == 180
+
+
+def test_cache_is_trimmed_to_longest_period(cache_path, monkeypatch):
+    today = pd.Timestamp.now(tz="UTC").tz_localize(None).normalize()
+    old = closes(pd.date_range(today - pd.Timedelta(days=800), today - pd.Timedelta(days=1)))
+    data_fetching.write_yahoo_cache(old)
+    fake_yahoo(monkeypatch)
+
+    data_fetching.fetch_yahoo_close("1y", "1d")
+
+    on_disk = pd.read_parquet(cache_path)
+    assert len(on_disk) == data_fetching.YAHOO_CACHE_DAYS
+    assert on_disk.index.max() == today